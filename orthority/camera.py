@@ -387,12 +387,13 @@ class Camera(ABC):
         # remap image to ortho, looping over band(s) (cv2.remap does not support rasterio
         # band ordering, does not support 3D images with >4 bands, and is slower on a re-ordered
         # 3D image than in a loop over bands)
+        interp_cv = Interp[interp].to_cv()
         for oi in range(0, im_array.shape[0]):
             cv2.remap(
                 im_array[oi],
                 j,
                 i,
-                Interp[interp].to_cv(),
+                interp_cv,
                 dst=remap_array[oi],
                 borderMode=cv2.BORDER_TRANSPARENT,
             )
@@ -924,11 +925,12 @@ class FrameCamera(Camera):
             nodata = self._get_dtype_nodata(im_array.dtype)
         und_array = np.full(im_array.shape, dtype=im_array.dtype, fill_value=nodata)
 
+        interp_cv = Interp[interp].to_cv()
         for bi in range(im_array.shape[0]):
             cv2.remap(
                 im_array[bi],
                 *self._undistort_maps,
-                Interp[interp].to_cv(),
+                interp_cv,
                 dst=und_array[bi],
                 borderMode=cv2.BORDER_TRANSPARENT,
             )
@@ -21,6 +21,17 @@ import cv2
 from rasterio.enums import Resampling
 
 
+# Interp name to OpenCV interpolation type mapping, built once at import for use in per-tile /
+# per-band remapping.
+_INTERP_TO_CV = dict(
+    average=cv2.INTER_AREA,
+    bilinear=cv2.INTER_LINEAR,
+    cubic=cv2.INTER_CUBIC,
+    lanczos=cv2.INTER_LANCZOS4,
+    nearest=cv2.INTER_NEAREST,
+)
+
+
 class CameraType(str, Enum):
     """Camera model types."""
 
@@ -53,21 +64,30 @@ class CameraType(str, Enum):
     rpc = 'rpc'
     """RPC camera model."""
 
-    def __repr__(self):
-        return self._name_
-
     def __str__(self):
         return self._name_
 
+    __repr__ = __str__
+
     @classmethod
     def from_odm(cls, cam_type: str):
         """Convert from OpenDroneMap / OpenSfM projection type."""
         cam_type = cam_type.lower().strip()
-        if cam_type in ['perspective', 'simple_radial', 'radial']:
-            cam_type = 'brown'
-        if cam_type not in cls.__members__ or cam_type == 'rpc':
+        member = _ODM_TO_CAMERA_TYPE.get(cam_type)
+        if member is None:
             raise ValueError(f"Unsupported OpenDroneMap / OpenSfM camera type: '{cam_type}'")
-        return cls(cam_type)
+        return member
+
+
+# OpenDroneMap / OpenSfM projection type to CameraType mapping, built once at import ('rpc' has
+# no ODM / OpenSfM equivalent, & 'perspective', 'simple_radial' & 'radial' parameters are
+# compatible with the brown model)
+_ODM_TO_CAMERA_TYPE = {
+    member._name_: member for member in CameraType if member is not CameraType.rpc
+}
+_ODM_TO_CAMERA_TYPE.update(
+    perspective=CameraType.brown, simple_radial=CameraType.brown, radial=CameraType.brown
+)
 
 
 class Interp(str, Enum):
@@ -84,26 +104,36 @@ class Interp(str, Enum):
     lanczos = 'lanczos'
     """Lanczos windowed sinc interpolation."""
 
-    def __repr__(self):
-        return self._name_
-
     def __str__(self):
         return self._name_
 
+    __repr__ = __str__
+
     def to_cv(self) -> int:
         """Convert to OpenCV interpolation type."""
-        name_to_cv = dict(
-            average=cv2.INTER_AREA,
-            bilinear=cv2.INTER_LINEAR,
-            cubic=cv2.INTER_CUBIC,
-            lanczos=cv2.INTER_LANCZOS4,
-            nearest=cv2.INTER_NEAREST,
-        )
-        return name_to_cv[self._name_]
+        if self._cv is None:
+            raise ValueError(f"'{self._name_}' has no OpenCV interpolation type.")
+        return self._cv
 
     def to_rio(self) -> Resampling:
         """Convert to rasterio resampling type."""
-        return Resampling[self._name_]
+        return self._rio
+
+    @classmethod
+    def cv_list(cls) -> list[Interp]:
+        """Members with an OpenCV interpolation type."""
+        return _CV_LIST
+
+
+# cache the OpenCV & rasterio equivalents on each member so to_cv() / to_rio() are single
+# attribute loads
+for _interp in Interp:
+    _interp._cv = _INTERP_TO_CV.get(_interp._name_)
+    _interp._rio = Resampling[_interp._name_]
+del _interp
+
+# computed once at import so repeated cv_list() calls return the same list
+_CV_LIST = [interp for interp in Interp if interp._cv is not None]
 
 
 class Compress(str, Enum):
@@ -114,12 +144,11 @@ class Compress(str, Enum):
     deflate = 'deflate'
     """Deflate compression."""
 
-    def __repr__(self):
-        return self._name_
-
     def __str__(self):
         return self._name_
 
+    __repr__ = __str__
+
 
 class CsvFormat(Enum):
     """Type of the position and orientation values in a CSV exterior parameter file."""
@@ -136,9 +165,14 @@ class CsvFormat(Enum):
     @property
     def is_xyz(self) -> bool:
         """Whether the format has (x, y, z) position."""
-        return self is CsvFormat.xyz_opk or self is CsvFormat.xyz_rpy
+        return self in _XYZ_FORMATS
 
     @property
     def is_opk(self) -> bool:
         """Whether the format has (omega, phi, kappa) orientation."""
-        return self is CsvFormat.xyz_opk or self is CsvFormat.lla_opk
+        return self in _OPK_FORMATS
+
+
+# (x, y, z) position and (omega, phi, kappa) orientation format sets, built once at import
+_XYZ_FORMATS = frozenset([CsvFormat.xyz_opk, CsvFormat.xyz_rpy])
+_OPK_FORMATS = frozenset([CsvFormat.xyz_opk, CsvFormat.lla_opk])
@@ -18,16 +18,21 @@ from __future__ import annotations
 
 import cProfile
 import logging
+import math
 import os
 import posixpath
 import pstats
 import tracemalloc
 import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager, ExitStack
+from functools import lru_cache
 from io import IOBase
 from os import PathLike
 from pathlib import Path
 from typing import IO, Iterable
+from weakref import WeakKeyDictionary
 
 import cv2
 import fsspec
@@ -61,51 +66,125 @@ def suppress_no_georef():
 
 def expand_window_to_grid(win: Window, expand_pixels: tuple[int, int] = (0, 0)) -> Window:
     """Expand rasterio window extents to the nearest whole numbers."""
-    col_off, col_frac = np.divmod(win.col_off - expand_pixels[1], 1)
-    row_off, row_frac = np.divmod(win.row_off - expand_pixels[0], 1)
-    width = np.ceil(win.width + 2 * expand_pixels[1] + col_frac)
-    height = np.ceil(win.height + 2 * expand_pixels[0] + row_frac)
-    exp_win = Window(
-        col_off.astype('int'), row_off.astype('int'), width.astype('int'), height.astype('int')
-    )
-    return exp_win
+    col_off = math.floor(win.col_off - expand_pixels[1])
+    row_off = math.floor(win.row_off - expand_pixels[0])
+    col_frac = win.col_off - expand_pixels[1] - col_off
+    row_frac = win.row_off - expand_pixels[0] - row_off
+    width = math.ceil(win.width + 2 * expand_pixels[1] + col_frac)
+    height = math.ceil(win.height + 2 * expand_pixels[0] + row_frac)
+    return Window(col_off, row_off, width, height)
 
 
 def nan_equals(a: np.ndarray | float, b: np.ndarray | float) -> np.ndarray:
     """Compare two numpy objects a & b, returning true where elements of both a & b are nan."""
-    return (a == b) | (np.isnan(a) & np.isnan(b))
+    eq = a == b
+    # nan != nan, so the nan comparison is skipped unless both a & b can hold nans (this leaves
+    # the comparison of integer imagery against an integer nodata as a single pass)
+    if np.issubdtype(np.result_type(a), np.floating) and np.issubdtype(
+        np.result_type(b), np.floating
+    ):
+        nan_eq = np.isnan(a) & np.isnan(b)
+        eq = np.logical_or(eq, nan_eq, out=eq) if isinstance(eq, np.ndarray) else eq | nan_eq
+    return eq
+
+
+_distort_maps_cache = WeakKeyDictionary()
+"""Cache of ``camera``: (``camera._K_undistort``, maps) items for :func:`_get_distort_maps`."""
+
+
+def _get_distort_maps(camera) -> np.ndarray:
+    """Return cv2.remap() maps for distorting an image with the given frame camera model.  Maps
+    are cached per-camera, and found on first use or when the camera's undistorted intrinsic
+    matrix has changed.
+    """
+    from orthority.camera import FrameCamera  # imported here to avoid a circular import
+
+    cached = _distort_maps_cache.get(camera)
+    if cached is not None and cached[0] is camera._K_undistort:
+        return cached[1]
+
+    # whether the camera's pixel -> camera transform is purely projective (no distortion)
+    projective = type(camera)._pixel_to_camera is FrameCamera._pixel_to_camera
+
+    # create (j, i) pixel coords for distorted image, writing into a single preallocated array
+    # with broadcasting rather than via meshgrid & row_stack temporaries ('float64' avoids a
+    # copy in camera._pixel_to_camera() on the distortion path)
+    w, h = camera.im_size
+    ji = np.empty((2, h * w), dtype='float32' if projective else 'float64')
+    ji[0].reshape(h, w)[:] = np.arange(w, dtype=ji.dtype)
+    ji[1].reshape(h, w)[:] = np.arange(h, dtype=ji.dtype)[:, None]
+
+    undist_ji = np.empty((2, h * w), dtype='float32')
+    if projective:
+        # fuse the pixel -> camera -> undistorted pixel transforms into a single affine matrix
+        # product, skipping the homogeneous camera coordinate intermediate
+        M = camera._K_undistort.dot(camera._K_undistort_inv).astype('float32')
+        np.dot(M[:2, :2], ji, out=undist_ji)
+        undist_ji += M[:2, 2:]
+    else:
+        # find the corresponding undistorted/ source (j, i) pixel coords, writing the first 2
+        # rows of K_undistort.dot(camera_xyz) directly into a float32 array rather than slicing
+        # & converting a full 3xN float64 product
+        camera_xyz = camera._pixel_to_camera(ji)
+        np.dot(
+            camera._K_undistort[:2].astype('float32'),
+            camera_xyz.astype('float32', copy=False),
+            out=undist_ji,
+        )
+
+    _distort_maps_cache[camera] = (camera._K_undistort, undist_ji)
+    return undist_ji
 
 
 def distort_image(camera, image: np.ndarray, nodata=0, interp=Interp.nearest) -> np.ndarray:
     """Return a distorted image given a frame camera model and source image."""
 
-    if not np.all(np.array(image.shape[-2:][::-1]) == camera.im_size):
+    w, h = camera.im_size
+    if image.shape[-1] != w or image.shape[-2] != h:
         raise ValueError("'image' shape should be the same as the 'camera' image size.")
 
-    # create (j, i) pixel coords for distorted image
-    j_range = np.arange(0, camera.im_size[0])
-    i_range = np.arange(0, camera.im_size[1])
-    j_grid, i_grid = np.meshgrid(j_range, i_range, indexing='xy')
-    ji = np.array((j_grid.reshape(-1), i_grid.reshape(-1)))
+    undist_ji = _get_distort_maps(camera)
 
-    # find the corresponding undistorted/ source (j, i) pixel coords
-    camera_xyz = camera._pixel_to_camera(ji)
-    undist_ji = camera._K_undistort.dot(camera_xyz)[:2].astype('float32')
+    interp_cv = Interp[interp].to_cv()
 
-    def distort_band(src_array: np.ndarray, dst_array: np.ndarray):
-        """Distort a 2D band array."""
+    # convert maps to fixed point for nearest interpolation, which halves map memory & speeds up
+    # remapping (fixed point maps are avoided with other interpolations - see the note in
+    # FrameCamera._get_undistort_maps())
+    dist_maps = (undist_ji[0].reshape(h, w), undist_ji[1].reshape(h, w))
+    if interp_cv == cv2.INTER_NEAREST:
+        dist_maps = cv2.convertMaps(*dist_maps, cv2.CV_16SC2, nninterpolation=True)
+
+    def distort_tile(src_array: np.ndarray, dst_array: np.ndarray, tile_slice: slice):
+        """Distort a row strip of a 2D band array."""
         cv2.remap(
             src_array,
-            undist_ji[0].reshape(image.shape[-2:]),
-            undist_ji[1].reshape(image.shape[-2:]),
-            Interp[interp].to_cv(),
-            dst=dst_array,
+            dist_maps[0][tile_slice],
+            dist_maps[1][tile_slice] if dist_maps[1] is not None else None,
+            interp_cv,
+            dst=dst_array[tile_slice],
             borderMode=cv2.BORDER_TRANSPARENT,
         )
 
-    dist_image = np.full(image.shape, dtype=image.dtype, fill_value=nodata)
-    for bi in range(image.shape[0]):
-        distort_band(image[bi], dist_image[bi])
+    # split bands into row strips and remap strips concurrently (each remapped pixel depends
+    # only on its own map value, so strips are independent)
+    strip_height = max(h // os.cpu_count(), 1)
+    tile_slices = [slice(i, min(i + strip_height, h)) for i in range(0, h, strip_height)]
+
+    # remapping with BORDER_TRANSPARENT leaves unmapped pixels at their initial value, so the
+    # destination is pre-filled with nodata (np.zeros can use lazily allocated zero pages,
+    # avoiding an explicit fill pass in the common nodata == 0 case)
+    if nodata == 0:
+        dist_image = np.zeros(image.shape, dtype=image.dtype)
+    else:
+        dist_image = np.full(image.shape, dtype=image.dtype, fill_value=nodata)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [
+            executor.submit(distort_tile, image[bi], dist_image[bi], tile_slice)
+            for bi in range(image.shape[0])
+            for tile_slice in tile_slices
+        ]
+        for future in futures:
+            future.result()
 
     return dist_image
 
@@ -113,34 +192,110 @@ def distort_image(camera, image: np.ndarray, nodata=0, interp=Interp.nearest) ->
 @contextmanager
 def profiler():
     """Context manager for profiling in DEBUG log level."""
-    if logger.getEffectiveLevel() <= logging.DEBUG:
-        proc_profile = cProfile.Profile()
-        tracemalloc.start()
-        proc_profile.enable()
-
+    # no-op fast path when DEBUG is not enabled (the level is tested per call, not at import,
+    # as the CLI configures logging after this module is imported)
+    if logger.getEffectiveLevel() > logging.DEBUG:
         yield
+        return
+
+    proc_profile = cProfile.Profile()
+    tracemalloc.start()
+    proc_profile.enable()
+
+    yield
+
+    proc_profile.disable()
+    # tottime is the total time spent in the function alone. cumtime is the total time spent
+    # in the function plus all functions that this function called
+    proc_stats = pstats.Stats(proc_profile).sort_stats('cumtime')
+    logger.debug(f'Processing times:')
+    proc_stats.print_stats(20)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    logger.debug(
+        f"Memory usage: current: {current / 10 ** 6:.1f} MB, peak: {peak / 10 ** 6:.1f} MB"
+    )
 
-        proc_profile.disable()
-        # tottime is the total time spent in the function alone. cumtime is the total time spent
-        # in the function plus all functions that this function called
-        proc_stats = pstats.Stats(proc_profile).sort_stats('cumtime')
-        logger.debug(f'Processing times:')
-        proc_stats.print_stats(20)
-        current, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-        logger.debug(
-            f"Memory usage: current: {current / 10 ** 6:.1f} MB, peak: {peak / 10 ** 6:.1f} MB"
-        )
-    else:
-        yield
+
+@lru_cache(maxsize=None)
+def _crs_from_epsg(epsg: int) -> CRS:
+    """Return a cached rasterio CRS for the given EPSG code."""
+    return CRS.from_epsg(epsg)
 
 
 def utm_crs_from_latlon(lat: float, lon: float) -> CRS:
     """Return a 2D rasterio UTM CRS for the given (lat, lon) coordinates in degrees."""
     # adapted from https://gis.stackexchange.com/questions/269518/auto-select-suitable-utm-zone-based-on-grid-intersection
-    zone = int(np.floor((lon + 180) / 6) % 60) + 1
+    zone = int((lon + 180) // 6) % 60 + 1
     epsg = 32600 + zone if lat >= 0 else 32700 + zone
-    return CRS.from_epsg(epsg)
+    return _crs_from_epsg(epsg)
+
+
+_missing = object()
+"""Sentinel for a missing :func:`validate_collection` key."""
+
+
+def _validate_dict(template: dict, coll, stack: deque):
+    """Validate ``coll`` against a dict ``template`` of types or other dicts.  Items are pushed
+    in reverse so they are validated in template order.
+    """
+    if isinstance(coll, dict):
+        for k in reversed(template):
+            stack.append((template[k], coll[k]) if k in coll else (k, _missing))
+    else:
+        _validate_value(template, coll, stack)
+
+
+def _validate_list(template: list, coll, stack: deque):
+    """Validate ``coll`` against a list ``template`` in the form [type or dict]."""
+    if isinstance(coll, list) and len(template) and len(coll):
+        for item in reversed(coll):
+            stack.append((template[0], item))
+    else:
+        _validate_value(template, coll, stack)
+
+
+def _validate_type(template: type, coll, stack: deque):
+    """Validate ``coll`` against a ``template`` type."""
+    if not isinstance(coll, template):
+        raise TypeError(f"'{coll}' is not an instance of {template}.")
+
+
+def _validate_tuple(template: tuple, coll, stack: deque):
+    """Validate ``coll`` against a ``template`` tuple of types."""
+    if all([isinstance(item, type) for item in template]):
+        if not isinstance(coll, template):
+            raise TypeError(f"'{coll}' is not an instance of any of {template}.")
+    else:
+        _validate_value(template, coll, stack)
+
+
+def _validate_value(template, coll, stack: deque):
+    """Validate ``coll`` against a ``template`` value."""
+    if template is not None and not coll == template:
+        raise ValueError(f"'{coll}' does not equal '{template}'.")
+
+
+def _validate_fallback(template, coll, stack: deque):
+    """Validate ``coll`` against a ``template`` whose type is not in the dispatch table (e.g. a
+    dict / list / tuple / type subclass).
+    """
+    if isinstance(template, dict):
+        _validate_dict(template, coll, stack)
+    elif isinstance(template, list):
+        _validate_list(template, coll, stack)
+    elif isinstance(template, type):
+        _validate_type(template, coll, stack)
+    elif isinstance(template, tuple):
+        _validate_tuple(template, coll, stack)
+    else:
+        _validate_value(template, coll, stack)
+
+
+_validate_dispatch = {dict: _validate_dict, list: _validate_list, tuple: _validate_tuple}
+_validate_dispatch.update({type(item): _validate_value for item in ('', 0, 0.0, False)})
+_validate_dispatch[type] = _validate_type
+"""Template type to handler dispatch table for :func:`validate_collection`."""
 
 
 def validate_collection(template: Iterable, coll: Iterable):
@@ -152,29 +307,14 @@ def validate_collection(template: Iterable, coll: Iterable):
     ``template`` list.
     """
     # adapted from https://stackoverflow.com/questions/45812387/how-to-validate-structure-or-schema-of-dictionary-in-python
-    if isinstance(template, dict) and isinstance(coll, dict):
-        # struct is a dict of types or other dicts
-        for k in template:
-            if k in coll:
-                validate_collection(template[k], coll[k])
-            else:
-                raise KeyError(f"No key: '{k}'.")
-    elif isinstance(template, list) and isinstance(coll, list) and len(template) and len(coll):
-        # struct is list in the form [type or dict]
-        for item in coll:
-            validate_collection(template[0], item)
-    elif isinstance(template, type):
-        # struct is the type of conf
-        if not isinstance(coll, template):
-            raise TypeError(f"'{coll}' is not an instance of {template}.")
-    elif isinstance(template, tuple) and all([isinstance(item, type) for item in template]):
-        # struct is a tuple of types
-        if not isinstance(coll, template):
-            raise TypeError(f"'{coll}' is not an instance of any of {template}.")
-    elif isinstance(template, object) and template is not None:
-        # struct is the value of conf
-        if not coll == template:
-            raise ValueError(f"'{coll}' does not equal '{template}'.")
+    # (iterative depth-first traversal, dispatching on the template item type)
+    dispatch_get = _validate_dispatch.get
+    stack = deque([(template, coll)])
+    while stack:
+        template, coll = stack.pop()
+        if coll is _missing:
+            raise KeyError(f"No key: '{template}'.")
+        dispatch_get(type(template), _validate_fallback)(template, coll, stack)
 
 
 def get_filename(file: str | PathLike | OpenFile | DatasetReaderBase | IO) -> str: